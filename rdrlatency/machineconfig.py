@@ -30,58 +30,18 @@ References:
 
 
 import base64
+import functools
 import os
 import os.path
-import textwrap
 
-import yaml
+import orjson
 
 
 HERE = os.path.abspath(os.path.dirname(__file__))
 SYSTEMD_DIR = os.path.join(HERE, "systemd")
 
-
-MACHINECONFIG_SKELL = textwrap.dedent(
-    """
-    apiVersion: machineconfiguration.openshift.io/v1
-    kind: MachineConfig
-    metadata:
-      name: TODO
-      labels:
-        machineconfiguration.openshift.io/role: TODO
-    spec:
-      config:
-        ignition:
-          version: 3.1.0
-        storage:
-          files: []
-        systemd:
-          units: []
-"""
-)
-
-
-FILE_SKEL = textwrap.dedent(
-    """
-    path: TODO
-    contents:
-      source: TODO
-    mode: 0444
-    user:
-      name: root
-    group:
-      name: root
-"""
-)
-
-
-UNIT_SKEL = textwrap.dedent(
-    """
-    name: TODO
-    enabled: true
-    contents: TODO
-"""
-)
+# MCO can deploy files to /etc and /var directories only
+MCO_TARGET_DIRS = ("/etc", "/var")
 
 
 def create_file_dict(basename, content, target_dir="/etc"):
@@ -92,7 +52,7 @@ def create_file_dict(basename, content, target_dir="/etc"):
 
     Args:
         basename (str): basename of the file
-        content (str): content of the file
+        content (str or bytes): content of the file, bytes are used as is
         target_dir (str): absolute path where to place the file, eg. ``/etc``
 
     Returns:
@@ -103,23 +63,28 @@ def create_file_dict(basename, content, target_dir="/etc"):
     """
     if basename is None or len(basename) == 0:
         raise ValueError("basename should not be empty")
-    file_dict = yaml.safe_load(FILE_SKEL)
-    # MCO can deploy files to /etc and /var directories only
     if not target_dir.startswith("/"):
         raise ValueError(
             f"target_dir '{target_dir}' shouldn't be relative, use abs. path"
         )
     target_dir = os.path.normpath(target_dir)
-    if not (target_dir.startswith("/etc") or target_dir.startswith("/var")):
+    if not target_dir.startswith(MCO_TARGET_DIRS):
         raise ValueError(
             f"target_dir '{target_dir}' should not be outside of /etc or /var"
         )
-    file_dict["path"] = os.path.join(target_dir, basename)
     # Ignition requires content of storage.file entry to be provided via an
     # URL and accepts rfc2397 "data" URL scheme.
     source_prefix = "data:text/plain;charset=utf-8;base64,"
-    content_base64 = base64.b64encode(content.encode()).decode()
-    file_dict["contents"]["source"] = source_prefix + content_base64
+    if isinstance(content, str):
+        content = content.encode()
+    content_base64 = base64.b64encode(content).decode("ascii")
+    file_dict = {
+        "path": os.path.join(target_dir, basename),
+        "contents": {"source": source_prefix + content_base64},
+        "mode": 0o444,
+        "user": {"name": "root"},
+        "group": {"name": "root"},
+    }
     return file_dict
 
 
@@ -137,9 +102,7 @@ def create_unit_dict(name, content):
     """
     if name is None or len(name) == 0:
         raise ValueError("name of the unit should not be empty")
-    unit_dict = yaml.safe_load(UNIT_SKEL)
-    unit_dict["name"] = name
-    unit_dict["contents"] = content
+    unit_dict = {"name": name, "enabled": True, "contents": content}
     return unit_dict
 
 
@@ -151,11 +114,34 @@ def get_new_mc(role, name_suffix, priority=99):
         role (string): name of ``MachineConfig`` role
         name_suffix (string): suffix of resulting MachineConfig name
     """
-    mcd = yaml.safe_load(MACHINECONFIG_SKELL)
-    mcd["metadata"]["name"] = str(priority) + "-" + role + "-" + name_suffix
-    mcd["metadata"]["labels"]["machineconfiguration.openshift.io/role"] = role
+    mcd = {
+        "apiVersion": "machineconfiguration.openshift.io/v1",
+        "kind": "MachineConfig",
+        "metadata": {
+            "name": str(priority) + "-" + role + "-" + name_suffix,
+            "labels": {"machineconfiguration.openshift.io/role": role},
+        },
+        "spec": {
+            "config": {
+                "ignition": {"version": "3.1.0"},
+                "storage": {"files": []},
+                "systemd": {"units": []},
+            },
+        },
+    }
     return mcd
 
+
+@functools.lru_cache(maxsize=None)
+def _read_unit_file(unit_filename):
+    """
+    Read given systemd unit file from ocpnetsplit module, the content is
+    cached as the unit files don't change during a run.
+    """
+    with open(os.path.join(SYSTEMD_DIR, unit_filename), "r") as unit_file:
+        return unit_file.read()
+
+
 def create_systemdunit_dict(unit_filename):
     """
     Create file dict with given systemd unit file from ocpnetsplit module.
@@ -166,6 +152,28 @@ def create_systemdunit_dict(unit_filename):
     Returns:
         dict: Ignition storage file config spec
     """
-    with open(os.path.join(SYSTEMD_DIR, unit_filename), "r") as unit_file:
-        unit_dict = create_unit_dict(unit_filename, unit_file.read())
+    unit_dict = create_unit_dict(unit_filename, _read_unit_file(unit_filename))
     return unit_dict
+
+
+def write_mc_file(mc_list, file_path):
+    """
+    Write given ``MachineConfig`` dicts into a file as a multi document YAML
+    stream, which can be deployed via ``oc create -f``.
+
+    Every document is serialized as JSON (which is valid YAML) and starts with
+    ``---`` document marker, including the first one. The leading marker makes
+    sure that oc processes the file as YAML stream, as it would otherwise
+    switch to JSON stream decoder when the file starts with ``{``, which fails
+    on the markers between the documents.
+
+    Args:
+        mc_list (list): list of ``MachineConfig`` dicts
+        file_path (str): path of the file to write
+    """
+    mc_docs = [
+        b"---\n" + orjson.dumps(mc, option=orjson.OPT_INDENT_2) + b"\n"
+        for mc in mc_list
+    ]
+    with open(file_path, "wb") as outfile:
+        outfile.write(b"".join(mc_docs))
@@ -15,49 +15,51 @@
 # limitations under the License.
 
 
+import functools
 import logging
-import subprocess
 
-import yaml
+import kubernetes
 
 
 LOGGER = logging.getLogger(name=__file__)
 
 
-def run_oc(cmd_list, kubeconfig=None, oc_executable=None, timeout=600):
+@functools.lru_cache(maxsize=None)
+def get_core_api(kubeconfig=None):
     """
-    Run given oc command and log all it's output.
+    Get Kubernetes core API client for given kubeconfig. The client is created
+    once per kubeconfig and reused, so that the kubeconfig is not parsed again.
 
     Args:
-        cmd_list (list): oc command to run, eg. ``["get", "nodes"]`` will
-            execute ``oc get nodes`` process
-        timeout (int): command timeout specified in seconds, optional
         kubeconfig (str): file path to kubeconfig (optional, use only if you
             need to override the default)
-        oc_executable (str): file path of oc command (optional, use only if
-            you need to override the default)
 
     Returns:
-        tuple: stdout, stderr of the command executed
+        kubernetes.client.CoreV1Api: core API client
     """
-    if oc_executable is None:
-        oc_executable = "oc"
-    oc_cmd = [oc_executable]
-    if kubeconfig is not None:
-        oc_cmd.extend(["--kubeconfig", kubeconfig])
-    oc_cmd.extend(cmd_list)
-    LOGGER.info("going to execute %s", oc_cmd)
-    comp_proc = subprocess.run(oc_cmd, capture_output=True, timeout=timeout)
-    # log whole output of the process
-    proc_log_level = logging.DEBUG
-    if comp_proc.returncode > 0:
-        proc_log_level = logging.WARNING
-    LOGGER.log(proc_log_level, "oc stdout: %s", comp_proc.stdout)
-    LOGGER.log(proc_log_level, "oc stderr: %s", comp_proc.stderr)
-    LOGGER.log(proc_log_level, "oc return code: %d", comp_proc.returncode)
-    # after the logging is done, we can raise the exception if necessary
-    comp_proc.check_returncode()
-    # if all is ok, let's return output
-    stdout = comp_proc.stdout.decode()
-    stderr = comp_proc.stderr.decode()
-    return stdout, stderr
+    api_client = kubernetes.config.new_client_from_config(config_file=kubeconfig)
+    return kubernetes.client.CoreV1Api(api_client)
+
+
+def get_node_addresses(kubeconfig=None, address_type="ExternalIP", timeout=600):
+    """
+    List addresses of given type of all nodes of the cluster.
+
+    Args:
+        kubeconfig (str): file path to kubeconfig (optional, use only if you
+            need to override the default)
+        address_type (str): type of node address, eg. ``InternalIP``
+        timeout (int): request timeout specified in seconds, optional
+
+    Returns:
+        list: addresses of the nodes
+    """
+    LOGGER.info("going to list nodes of cluster %s", kubeconfig)
+    nodes = get_core_api(kubeconfig).list_node(_request_timeout=timeout)
+    addrs = []
+    for node in nodes.items:
+        for addr in node.status.addresses or []:
+            if addr.type == address_type:
+                addrs.append(addr.address)
+    LOGGER.debug("%s addresses: %s", address_type, addrs)
+    return addrs
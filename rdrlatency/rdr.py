@@ -1,44 +1,29 @@
 import argparse
+import concurrent.futures
 import logging
 import os
 
-import yaml
-
-from ocpnetsplit.machineconfig import (
+from rdrlatency.machineconfig import (
     get_new_mc,
     create_file_dict,
     create_systemdunit_dict,
+    write_mc_file,
 )
-from ocpnetsplit.ocp import run_oc
+from rdrlatency.ocp import get_node_addresses
 
 logging.basicConfig(level=logging.INFO)
 
 
-def create_latency_mc_dict(role, latency, ip_list):
-    """
-    Create ``MachineConfig`` dict with latency systemd units and scripts.
-
-    Args:
-
-        mcp (string): name of ``MachineConfig`` role (and also
-            ``MachineConfigPool``) where the ``MachineConfig`` generated by
-            this function should be deployed. Usually ``master`` or ``worker``.
-        latency (int): zone latency created via Linux Traffic Control in ms
-
-    Returns:
-        dict: MachineConfig dict
-    """
-    temp = latency / 2
-    latency = int(temp)
-    mcd = get_new_mc(role, "network-latency")
+# config file to modprobe sch_netem kernel module, the same for all clusters,
+# it's never modified so it's shared by all MachineConfigs
+_SCH_NETEM_FILE_DICT = create_file_dict(
+    "sch_netem.conf", "sch_netem", target_dir="/etc/modules-load.d"
+)
 
-    # include a config file to modprobe sch_netem kernel module
-    file_dict = create_file_dict(
-        "sch_netem.conf", "sch_netem", target_dir="/etc/modules-load.d"
-    )
-    mcd["spec"]["config"]["storage"]["files"].append(file_dict)
 
-    network_latency = f"""#!/bin/bash
+# network latency script, with __IP_LIST__ placeholder for addresses of nodes
+# in other zones
+_NETWORK_LATENCY_TMPL = """#!/bin/bash
 # Copyright 2021 Martin Bukatovič <mbukatov@redhat.com>
 #
 # Licensed under the Apache License, Version 2.0 (the "License");
@@ -81,24 +66,48 @@ iface=$(ip route show default | cut -d' ' -f5)
 
 # TODO: polish this to create as few changes in traffic queues as possible,
 # so that the original configuration could be restored without node reboot
-$DEBUG_MODE tc qdisc del dev "${{iface}}" root
-$DEBUG_MODE tc qdisc add dev "${{iface}}" root handle 1: prio
-$DEBUG_MODE tc qdisc add dev "${{iface}}" parent 1:1 handle 2: netem delay "${{latency}}"ms
+$DEBUG_MODE tc qdisc del dev "${iface}" root
+$DEBUG_MODE tc qdisc add dev "${iface}" root handle 1: prio
+$DEBUG_MODE tc qdisc add dev "${iface}" parent 1:1 handle 2: netem delay "${latency}"ms
 
 # create tc filter/classifier for nodes in other zones, and direct traffic
 # heading to them via netem qdisc
-declare -a ip_list=({ip_list})
+declare -a ip_list=(__IP_LIST__)
 
 
-for ip_adddr in "${{ip_list[@]}}"; do
-    $DEBUG_MODE tc filter add dev "${{iface}}" parent 1: protocol ip prio 2 u32 match ip dst $ip_adddr/32 flowid 3:1
+for ip_adddr in "${ip_list[@]}"; do
+    $DEBUG_MODE tc filter add dev "${iface}" parent 1: protocol ip prio 2 u32 match ip dst $ip_adddr/32 flowid 3:1
 done
 
     """
+
+
+def create_latency_mc_dict(role, latency, ip_list):
+    """
+    Create ``MachineConfig`` dict with latency systemd units and scripts.
+
+    Args:
+
+        mcp (string): name of ``MachineConfig`` role (and also
+            ``MachineConfigPool``) where the ``MachineConfig`` generated by
+            this function should be deployed. Usually ``master`` or ``worker``.
+        latency (int): zone latency created via Linux Traffic Control in ms
+
+    Returns:
+        dict: MachineConfig dict
+    """
+    temp = latency / 2
+    latency = int(temp)
+    mcd = get_new_mc(role, "network-latency")
+
+    # include a config file to modprobe sch_netem kernel module
+    mcd["spec"]["config"]["storage"]["files"].append(_SCH_NETEM_FILE_DICT)
+
+    network_latency = _NETWORK_LATENCY_TMPL.replace("__IP_LIST__", ip_list)
     # include latency script file
     script_dict = create_file_dict("network-latency.sh", network_latency)
+    script_dict["mode"] = 356
     mcd["spec"]["config"]["storage"]["files"].append(script_dict)
-    mcd["spec"]["config"]["storage"]["files"][1]["mode"] = 356
     # include systemd unit service for the latency script
     unit_dict = create_systemdunit_dict("network-latency.service")
     # hardcode the given latency value into systemd service unit
@@ -112,16 +121,9 @@ done
 
 
 def get_ip_address(kubeconfig):
-    ip_addrs = ""
-    oc_cmd = ["get", "nodes", "-o", "yaml"]
-    node_str, _ = run_oc(oc_cmd, kubeconfig)
-    node_dict = yaml.safe_load(node_str)
-    for i in node_dict["items"]:
-        for addr_d in i["status"]["addresses"]:
-            if addr_d["type"] not in ("ExternalIP"):
-                continue
-            ip_addrs += "'" + addr_d["address"] + "' "
-    return ip_addrs
+    addrs = get_node_addresses(kubeconfig)
+    # trailing space allows to simply concatenate results of multiple calls
+    return "".join([f"'{addr}' " for addr in addrs])
 
 
 def generate_mc_files(ip_list, file_name, latency):
@@ -137,11 +139,13 @@ def generate_mc_files(ip_list, file_name, latency):
     path = os.path.join(os.getcwd(), "output")
     os.makedirs(path, exist_ok=True)
     file_path = f"{path}/{file_name}-mc.yaml"
-    mc_spec = []
-    for role in "master", "worker":
-        mc_spec.append(create_latency_mc_dict(role, latency, ip_list))
-    with open(file_path, "w") as outfile:
-        yaml.dump_all(mc_spec, outfile)
+    # master and worker MachineConfigs differ only in the role, so the worker
+    # one can reuse files and units of the master one
+    master_mc = create_latency_mc_dict("master", latency, ip_list)
+    worker_mc = get_new_mc("worker", "network-latency")
+    for key in "storage", "systemd":
+        worker_mc["spec"]["config"][key] = master_mc["spec"]["config"][key]
+    write_mc_file([master_mc, worker_mc], file_path)
 
 
 def main_setup_rdr():
@@ -190,15 +194,19 @@ def main_setup_rdr():
     )
     args = ap.parse_args()
 
-    hub = get_ip_address(kubeconfig=args.hub)
-    c1 = get_ip_address(kubeconfig=args.c1)
-    c2 = get_ip_address(kubeconfig=args.c2)
-
-    logging.info("Generating MachineConfigs for HUB ")
-    generate_mc_files(c1 + c2, "hub", args.latency)
-
-    logging.info("Generating MachineConfigs for C1 ")
-    generate_mc_files(hub + c2, "c1", args.latency)
-
-    logging.info("Generating MachineConfigs for C2 ")
-    generate_mc_files(hub + c1, "c2", args.latency)
+    # querying the clusters is independent, so let's do it in parallel
+    with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
+        hub, c1, c2 = executor.map(get_ip_address, [args.hub, args.c1, args.c2])
+
+    # each cluster gets latency to nodes of the other two clusters
+    mc_files = {"hub": c1 + c2, "c1": hub + c2, "c2": hub + c1}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
+        futures = []
+        for file_name, ip_list in mc_files.items():
+            logging.info("Generating MachineConfigs for %s", file_name.upper())
+            futures.append(
+                executor.submit(generate_mc_files, ip_list, file_name, args.latency)
+            )
+    # re-raise exception from any of the workers, if there was one
+    for future in futures:
+        future.result()
@@ -40,7 +40,8 @@ setup(
     ],
     keywords="openshift, firewall",
     packages=find_packages(exclude=["docs", "tests"]),
-    install_requires=["PyYAML"],
+    install_requires=["kubernetes", "orjson"],
+    extras_require={"test": ["pytest", "PyYAML"]},
     include_package_data=True,
     entry_points={
         "console_scripts": [
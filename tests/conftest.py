@@ -0,0 +1,44 @@
+# -*- coding: utf8 -*-
+
+
+from unittest import mock
+
+import pytest
+from kubernetes.client import V1Node, V1NodeAddress, V1NodeList, V1NodeStatus
+
+from rdrlatency import ocp
+
+
+@pytest.fixture
+def fake_nodes(monkeypatch):
+    """
+    Replace Kubernetes core API client with a fake one, which lists nodes
+    with a mix of address types, including a node without any addresses.
+    """
+    node_list = V1NodeList(
+        items=[
+            V1Node(
+                status=V1NodeStatus(
+                    addresses=[
+                        V1NodeAddress(type="InternalIP", address="10.0.0.1"),
+                        V1NodeAddress(type="ExternalIP", address="192.0.2.1"),
+                        V1NodeAddress(type="Hostname", address="node-1"),
+                    ]
+                )
+            ),
+            V1Node(status=V1NodeStatus(addresses=None)),
+            V1Node(
+                status=V1NodeStatus(
+                    addresses=[
+                        V1NodeAddress(type="ExternalIP", address="192.0.2.3"),
+                        V1NodeAddress(type="InternalIP", address="10.0.0.3"),
+                    ]
+                )
+            ),
+        ]
+    )
+    core_api = mock.Mock()
+    core_api.list_node.return_value = node_list
+    get_core_api = mock.Mock(return_value=core_api)
+    monkeypatch.setattr(ocp, "get_core_api", get_core_api)
+    return get_core_api
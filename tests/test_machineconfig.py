@@ -0,0 +1,16 @@
+# -*- coding: utf8 -*-
+
+
+import yaml
+
+from rdrlatency.machineconfig import get_new_mc, write_mc_file
+
+
+def test_write_mc_file_multidoc_stream(tmp_path):
+    mc_list = [get_new_mc(role, "test") for role in ("master", "worker")]
+    file_path = tmp_path / "test-mc.yaml"
+    write_mc_file(mc_list, file_path)
+    content = file_path.read_bytes()
+    # oc would use JSON stream decoder for a file starting with "{"
+    assert content.startswith(b"---\n")
+    assert list(yaml.safe_load_all(content)) == mc_list
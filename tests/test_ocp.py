@@ -0,0 +1,14 @@
+# -*- coding: utf8 -*-
+
+
+from rdrlatency.ocp import get_node_addresses
+
+
+def test_get_node_addresses_external(fake_nodes):
+    assert get_node_addresses("kubeconfig") == ["192.0.2.1", "192.0.2.3"]
+    fake_nodes.assert_called_once_with("kubeconfig")
+
+
+def test_get_node_addresses_internal(fake_nodes):
+    addrs = get_node_addresses(address_type="InternalIP")
+    assert addrs == ["10.0.0.1", "10.0.0.3"]
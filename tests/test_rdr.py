@@ -0,0 +1,43 @@
+# -*- coding: utf8 -*-
+
+
+import base64
+
+import yaml
+
+from rdrlatency import rdr
+
+
+def test_generate_mc_files(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    rdr.generate_mc_files("'10.0.0.1' '10.0.0.2' ", "c1", 20)
+    with open(tmp_path / "output" / "c1-mc.yaml") as mc_file:
+        master_mc, worker_mc = yaml.safe_load_all(mc_file)
+    role_label = "machineconfiguration.openshift.io/role"
+    assert master_mc["metadata"]["name"] == "99-master-network-latency"
+    assert master_mc["metadata"]["labels"][role_label] == "master"
+    assert worker_mc["metadata"]["name"] == "99-worker-network-latency"
+    assert worker_mc["metadata"]["labels"][role_label] == "worker"
+    # both roles deploy the same files and units
+    assert worker_mc["spec"] == master_mc["spec"]
+    files = worker_mc["spec"]["config"]["storage"]["files"]
+    assert [f["path"] for f in files] == [
+        "/etc/modules-load.d/sch_netem.conf",
+        "/etc/network-latency.sh",
+    ]
+    assert [f["mode"] for f in files] == [0o444, 356]
+    script_b64 = files[1]["contents"]["source"].split(",", 1)[1]
+    script = base64.b64decode(script_b64).decode()
+    assert "declare -a ip_list=('10.0.0.1' '10.0.0.2' )" in script
+    (unit,) = worker_mc["spec"]["config"]["systemd"]["units"]
+    assert unit["name"] == "network-latency.service"
+    # latency is split between both directions
+    assert '"/etc/network-latency.sh 10"' in unit["contents"]
+    assert "EnvironmentFile" not in unit["contents"]
+
+
+def test_get_ip_address(fake_nodes):
+    ip_addrs = rdr.get_ip_address("kubeconfig")
+    # trailing space keeps results of multiple calls separated when they are
+    # concatenated into a single bash array
+    assert ip_addrs == "'192.0.2.1' '192.0.2.3' "